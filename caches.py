@@ -0,0 +1,151 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from language import TokenBuilder
+from language import TokenParser
+
+from parsers import SyntaxError
+
+
+class ParseCache:
+
+    evict_ratio = 0.9
+    stale_age = 60 * 60
+
+    def __init__(self, directory='caches', capacity=64 * 1024 * 1024, rescan_interval=1000):
+        self.directory = directory
+        self.capacity = capacity
+        self.versions = {}
+
+        self.rescan_interval = rescan_interval
+        self.put_count = 0
+        self.size_estimate = None
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def file_version(paths):
+        version = hashlib.sha256()
+
+        for path in paths:
+            with open(path, 'rb') as version_file:
+                version.update(hashlib.sha256(version_file.read()).digest())
+
+        return version.digest()
+
+    @staticmethod
+    def serialize(error_list):
+        return json.dumps([[error.token.line, error.token.index, error.token.type, error.token.word, error.message] for error in error_list])
+
+    @staticmethod
+    def deserialize(input):
+        return [SyntaxError(TokenBuilder.full(int(line), int(index), type, word), message) for line, index, type, word, message in json.loads(input)]
+
+    def version(self, parser):
+        version_key = (type(parser), tuple(parser.grammar.version_paths))
+
+        if version_key not in self.versions:
+            self.versions[version_key] = self.file_version(version_key[1]) + version_key[0].__name__.encode()
+
+        return self.versions[version_key]
+
+    def key(self, parser, source_bytes):
+        return hashlib.sha256(self.version(parser) + source_bytes).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key):
+        try:
+            with open(self.path(key), 'r') as entry:
+                error_list = self.deserialize(entry.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+        try:
+            os.utime(self.path(key))
+        except FileNotFoundError:
+            pass
+
+        return error_list
+
+    def put(self, key, error_list):
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+
+        try:
+            with os.fdopen(descriptor, 'w') as entry:
+                entry_size = entry.write(self.serialize(error_list))
+
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        self.put_count += 1
+
+        if self.size_estimate is None or self.put_count % self.rescan_interval == 0:
+            self.size_estimate = sum(size for _, size, _ in self.entries())
+        else:
+            self.size_estimate += entry_size
+
+        if self.size_estimate > self.capacity:
+            self.evict()
+
+    def entries(self):
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.json'):
+                continue
+            try:
+                status = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            yield status.st_mtime, status.st_size, entry.path
+
+    def sweep(self):
+        stale_time = time.time() - self.stale_age
+
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.tmp'):
+                continue
+            try:
+                if entry.stat().st_mtime < stale_time:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def evict(self):
+        self.sweep()
+        entries = sorted(self.entries())
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total_size <= self.capacity * self.evict_ratio:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+            total_size -= size
+
+        self.size_estimate = total_size
+
+    def parse(self, parser, source_bytes):
+        key = self.key(parser, source_bytes)
+
+        if (error_list := self.get(key)) is not None:
+            return error_list
+
+        with io.TextIOWrapper(io.BytesIO(source_bytes)) as sources:
+            error_list = parser(TokenParser.list(sources.readlines()))
+
+        self.put(key, error_list)
+        return error_list
@@ -3,27 +3,34 @@ from language import TokenBuilder
 
 class Item:
 
+    __slots__ = ('formula', 'forward_index', 'forward_token', 'hash')
+
     def __init__(self, formula, forward_index, forward_token):
         self.formula = formula
         self.forward_index = forward_index
         self.forward_token = forward_token
+        self.hash = hash((formula.hash, forward_index, forward_token.hash))
 
     def __str__(self):
         return f'{self.formula}, {self.forward_index}, {self.forward_token}'
 
     def __eq__(self, item):
+        if self is item:
+            return True
         if not isinstance(item, Item):
             return False
-        if self.formula != item.formula:
+        if self.hash != item.hash:
             return False
         if self.forward_index != item.forward_index:
             return False
         if self.forward_token != item.forward_token:
             return False
+        if self.formula != item.formula:
+            return False
         return True
     
     def __hash__(self):
-        return hash(self.formula) + hash(self.forward_index) + hash(self.forward_token)
+        return self.hash
 
     @property
     def search_finished(self):
@@ -31,21 +38,19 @@ class Item:
 
     @property
     def current_element(self):
-        try:
+        if self.forward_index < self.formula.length:
             return self.formula.r_part[self.forward_index]
-        except IndexError:
-            return None
+        return None
 
     @property
     def next_element(self):
-        try:
+        if self.forward_index + 1 < self.formula.length:
             return self.formula.r_part[self.forward_index + 1]
-        except IndexError:
-            return None
+        return None
 
     @property
     def closure_enable(self):
-        return not self.search_finished and self.current_element.is_symbol
+        return self.forward_index < self.formula.length and self.formula.r_part[self.forward_index].is_symbol
 
 
 class ItemBuilder:
@@ -81,11 +86,18 @@ class ItemSetUtils:
 
         return {token for subset in ItemSetUtils.subsets(element, formulas, current_excepts) for token in subset}
 
+    @staticmethod
+    def cached_first_set(element, formulas):
+        if element not in formulas.first_dict:
+            formulas.first_dict[element] = ItemSetUtils.first_set(element, formulas)
+
+        return formulas.first_dict[element]
+
     @staticmethod
     def generate_closure_item(item, formulas):
         for formula in formulas.search(item.current_element.symbol):
             if next_element := item.next_element:
-                forward_set = ItemSetUtils.first_set(next_element, formulas)
+                forward_set = ItemSetUtils.cached_first_set(next_element, formulas)
             else:
                 forward_set = {item.forward_token}
 
@@ -96,17 +108,27 @@ class ItemSetUtils:
     def new_closure_items(item, closure, formulas):
         return {item for item in ItemSetUtils.generate_closure_item(item, formulas) if item not in closure}
 
+    @staticmethod
+    def closure_key(item):
+        if next_element := item.next_element:
+            return item.current_element, next_element
+        else:
+            return item.current_element, item.forward_token
+
     @staticmethod
     def closure(items, formulas):
         item_closure = items.copy()
         item_buffer = items.copy()
+        closure_keys = set()
 
         while len(item_buffer) > 0:
             await_items = filter(lambda item: item.closure_enable, item_buffer.copy())
             item_buffer.clear()
 
             for item in await_items:
-                item_buffer = item_buffer.union(ItemSetUtils.new_closure_items(item, item_closure, formulas))
+                if (closure_key := ItemSetUtils.closure_key(item)) not in closure_keys:
+                    closure_keys.add(closure_key)
+                    item_buffer.update(ItemSetUtils.new_closure_items(item, item_closure, formulas))
 
             item_closure = item_closure.union(item_buffer)
 
@@ -129,6 +151,7 @@ class ItemsNumber:
 
     def __init__(self, init_items):
         self.items_number = {init_items: 0}
+        self.number_items = [init_items]
         self.items_count = 1
 
     def __contains__(self, items):
@@ -142,6 +165,10 @@ class ItemsNumber:
             for item in items:
                 yield item, number
 
+    def items(self, number):
+        return self.number_items[number]
+
     def add(self, items):
         self.items_number[items] = self.items_count
+        self.number_items.append(items)
         self.items_count += 1
@@ -1,44 +1,83 @@
 import json
 import re
+import sys
 
 from collections import defaultdict
 
 
+class Immutable:
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+
 class Token:
 
+    __slots__ = ('line', 'index', 'type', 'word', 'key', 'hash')
+
     def __init__(self, line, index, type, word):
         self.line = line
         self.index = index
         self.type = type
         self.word = word
+        self.key = TokenBuilder.key(type, word)
+        self.hash = hash(self.key)
 
     def __str__(self):
         return f'<{self.type},{self.word}>'
 
     def __eq__(self, token):
+        if self is token:
+            return True
         if isinstance(token, Token):
-            if self.type == 'identifiers' or self.type == 'constants':
-                return self.type == token.type
-            else:
-                return self.type == token.type and self.word == token.word
+            return self.key is token.key
         return False
-    
+
     def __hash__(self):
-        if self.type == 'identifiers' or self.type == 'constants':
-            return hash(self.type)
-        else:
-            return hash(self.type) + hash(self.word)
+        return self.hash
 
     @property
     def is_end(self):
         return self.type == 'ends' and self.word == '#'
 
 
+class FrozenToken(Token, Immutable):
+
+    __slots__ = ()
+
+    def __init__(self, line, index, type, word):
+        key = TokenBuilder.key(type, word)
+
+        object.__setattr__(self, 'line', line)
+        object.__setattr__(self, 'index', index)
+        object.__setattr__(self, 'type', type)
+        object.__setattr__(self, 'word', word)
+        object.__setattr__(self, 'key', key)
+        object.__setattr__(self, 'hash', hash(key))
+
+
 class TokenBuilder:
 
+    keys = {}
+    tokens = {}
+
+    @staticmethod
+    def key(type, word):
+        if type == 'identifiers' or type == 'constants':
+            key = (type, None)
+        else:
+            key = (type, word)
+
+        return TokenBuilder.keys.setdefault(key, key)
+
     @staticmethod
     def ends():
-        return Token(0, 0, 'ends', '#')
+        return TokenBuilder.simply('ends', '#')
 
     @staticmethod
     def full(line, index, type, word):
@@ -46,7 +85,10 @@ class TokenBuilder:
 
     @staticmethod
     def simply(type, word):
-        return Token(0, 0, type, word)
+        if (type, word) not in TokenBuilder.tokens:
+            TokenBuilder.tokens[type, word] = FrozenToken(0, 0, type, word)
+
+        return TokenBuilder.tokens[type, word]
 
 
 class TokenParser:
@@ -55,8 +97,8 @@ class TokenParser:
     def full(input):
         match = re.match(r'<(.+?), (.+?), (.+?), (.*)>', input)
 
-        line = match.group(1)
-        index = match.group(2)
+        line = int(match.group(1))
+        index = int(match.group(2))
         type = match.group(3)
         word = match.group(4)
 
@@ -78,9 +120,18 @@ class TokenParser:
 
 class FormulaElement:
 
+    __slots__ = ('token', 'symbol', 'is_token', 'is_symbol', 'hash')
+
     def __init__(self, token, symbol):
         self.token = token
         self.symbol = symbol
+        self.is_token = token is not None
+        self.is_symbol = symbol is not None
+
+        if self.is_token:
+            self.hash = hash(token)
+        else:
+            self.hash = hash(symbol)
 
     def __str__(self):
         if self.is_token:
@@ -89,6 +140,8 @@ class FormulaElement:
             return str(self.symbol)
 
     def __eq__(self, element):
+        if self is element:
+            return True
         if isinstance(element, FormulaElement):
             if self.is_token:
                 return element.is_token and self.token == element.token
@@ -97,29 +150,43 @@ class FormulaElement:
         return False
     
     def __hash__(self):
-        if self.is_token:
-            return hash(self.token)
-        else:
-            return hash(self.symbol)
+        return self.hash
 
-    @property
-    def is_token(self):
-        return self.token is not None
 
-    @property
-    def is_symbol(self):
-        return self.symbol is not None
+class FrozenElement(FormulaElement, Immutable):
+
+    __slots__ = ()
+
+    def __init__(self, token, symbol):
+        object.__setattr__(self, 'token', token)
+        object.__setattr__(self, 'symbol', symbol)
+        object.__setattr__(self, 'is_token', token is not None)
+        object.__setattr__(self, 'is_symbol', symbol is not None)
+        object.__setattr__(self, 'hash', hash(token) if token is not None else hash(symbol))
 
 
 class ElementBuilder:
 
+    tokens = {}
+    symbols = {}
+
     @staticmethod
     def token(token):
-        return FormulaElement(token, None)
+        if token not in ElementBuilder.tokens:
+            ElementBuilder.tokens[token] = FrozenElement(token, None)
+
+        return ElementBuilder.tokens[token]
 
     @staticmethod
     def symbol(symbol):
-        return FormulaElement(None, symbol)
+        if symbol not in ElementBuilder.symbols:
+            ElementBuilder.symbols[symbol] = FrozenElement(None, symbol)
+
+        return ElementBuilder.symbols[symbol]
+
+    @staticmethod
+    def input(token):
+        return FormulaElement(token, None)
 
 
 class ElementUtils:
@@ -129,18 +196,29 @@ class ElementUtils:
         return ' '.join(map(str, element_list))
 
 
-class Formula:
+class Formula(Immutable):
+
+    __slots__ = ('l_part', 'r_part', 'precedence_token', 'length', 'hash')
 
-    def __init__(self, l_part, r_part):
-        self.l_part = l_part
-        self.r_part = r_part
+    def __init__(self, l_part, r_part, precedence_token=None):
+        r_part = tuple(r_part)
+
+        object.__setattr__(self, 'l_part', l_part)
+        object.__setattr__(self, 'r_part', r_part)
+        object.__setattr__(self, 'precedence_token', precedence_token)
+        object.__setattr__(self, 'length', len(r_part))
+        object.__setattr__(self, 'hash', hash((l_part, r_part)))
 
     def __str__(self):
         return f'{self.l_part} -> {ElementUtils.stringify(self.r_part)}'
 
     def __eq__(self, formula):
+        if self is formula:
+            return True
         if not isinstance(formula, Formula):
             return False
+        if self.hash != formula.hash:
+            return False
         if self.l_part != formula.l_part:
             return False
         if self.r_part != formula.r_part:
@@ -148,23 +226,85 @@ class Formula:
         return True
 
     def __hash__(self):
-        return hash(self.l_part) + sum(hash(item) for item in self.r_part)
+        return self.hash
 
     @property
     def head(self):
         return self.r_part[0]
 
     @property
-    def length(self):
-        return len(self.r_part)
+    def last_token(self):
+        for element in reversed(self.r_part):
+            if element.is_token:
+                return element.token
+        return None
+
+
+class Precedence:
+
+    def __init__(self, level, associativity):
+        self.level = level
+        self.associativity = associativity
+
+    def __str__(self):
+        return f'{self.associativity}-{self.level}'
+
+    @property
+    def is_left(self):
+        return self.associativity == 'left'
+
+    @property
+    def is_right(self):
+        return self.associativity == 'right'
+
+    @property
+    def is_nonassoc(self):
+        return self.associativity == 'nonassoc'
+
+
+class PrecedenceRules:
+
+    def __init__(self, rules):
+        self.rules = rules
+
+    def token(self, token):
+        return self.rules.get(token)
+
+    def formula(self, formula):
+        if formula.precedence_token is not None:
+            return self.token(formula.precedence_token)
+
+        if last_token := formula.last_token:
+            return self.token(last_token)
+        return None
+
+
+class PrecedenceParser:
+
+    associativities = ('left', 'right', 'nonassoc')
+
+    @staticmethod
+    def list(precedences):
+        rules = {}
+
+        for level, precedence in enumerate(precedences):
+            if precedence['associativity'] not in PrecedenceParser.associativities:
+                raise ValueError(f'unknown associativity: {precedence["associativity"]}')
+
+            for token in precedence['tokens']:
+                rules[TokenParser.simply(token)] = Precedence(level, precedence['associativity'])
+
+        return PrecedenceRules(rules)
 
 
 class FormulasWrapper:
 
-    def __init__(self, formulas):
+    def __init__(self, formulas, precedences):
         self.formulas = formulas
+        self.precedences = precedences
         self.number_dict = defaultdict(int)
         self.symbol_dict = defaultdict(set)
+        self.first_dict = {}
         self.setup_dicts()
 
     @property
@@ -180,6 +320,16 @@ class FormulasWrapper:
             self.number_dict[formula] = number
             self.symbol_dict[formula.l_part.symbol].add(formula)
 
+    @property
+    def memory_size(self):
+        objects = {id(element): element for formula in self.formulas for element in (formula.l_part, *formula.r_part)}
+
+        formulas_size = sum(sys.getsizeof(formula) + sys.getsizeof(formula.r_part) for formula in self.formulas)
+        elements_size = sum(sys.getsizeof(element) for element in objects.values())
+        dicts_size = sys.getsizeof(self.formulas) + sys.getsizeof(self.number_dict) + sys.getsizeof(self.symbol_dict)
+
+        return formulas_size + elements_size + dicts_size + sum(sys.getsizeof(formulas) for formulas in self.symbol_dict.values())
+
     def number(self, formula):
         return self.number_dict[formula]
 
@@ -200,9 +350,15 @@ class FormulaParser:
     def formula(input):
         left_content, right_content = input.split(' -> ')
 
+        if ' %prec ' in right_content:
+            right_content, precedence_content = right_content.split(' %prec ')
+            precedence_token = TokenParser.simply(precedence_content.strip())
+        else:
+            precedence_token = None
+
         return Formula(ElementBuilder.symbol(left_content), [
             FormulaParser.item(item) for item in right_content.split()
-        ])
+        ], precedence_token)
 
     @staticmethod
     def list(formulas):
@@ -212,16 +368,17 @@ class FormulaParser:
 class GrammarLoader:
 
     @staticmethod
-    def formulas():
-        with open('grammars/grammar.json', 'r') as grammar_json:
+    def formulas(path='grammars/grammar.json'):
+        with open(path, 'r') as grammar_json:
             grammar_config = json.load(grammar_json)
             formulas = grammar_config['formulas']
+            precedences = grammar_config.get('precedences', [])
 
-        return FormulasWrapper(FormulaParser.list(formulas))
+        return FormulasWrapper(FormulaParser.list(formulas), PrecedenceParser.list(precedences))
 
     @staticmethod
-    def messages():
-        with open('grammars/message.json', 'r') as message_json:
+    def messages(path='grammars/message.json'):
+        with open(path, 'r') as message_json:
             message_config = json.load(message_json)
             messages = message_config['messages']
             defaults = message_config['defaults']
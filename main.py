@@ -1,13 +1,26 @@
 from language import TokenParser
 from parsers import SyntaxParser
+from writers import WriterBuilder
 
 
-def syntax_parse(parser, source_path, output_path):
-    with open(source_path, 'r') as sources:
-        error_list = parser(TokenParser.list(sources.readlines()))
+def parse_errors(parser, source_path, cache=None):
+    if cache is None:
+        with open(source_path, 'r') as sources:
+            return parser.iterate(TokenParser.list(sources.readlines()))
+    else:
+        with open(source_path, 'rb') as sources:
+            return cache.parse(parser, sources.read())
 
-    with open(output_path, 'w') as outputs:
-        outputs.writelines(f'{error}\n' for error in error_list)
+
+def syntax_parse(parser, source_path, output_path, cache=None, format='text', compress=False):
+    with WriterBuilder.build(format, output_path, compress) as writer:
+        writer.write_all(parse_errors(parser, source_path, cache), source_path)
+
+
+def batch_parse(parser, source_paths, output_path, cache=None, format='text', compress=False):
+    with WriterBuilder.build(format, output_path, compress, aggregate=True) as writer:
+        for source_path in source_paths:
+            writer.write_all(parse_errors(parser, source_path, cache), source_path)
 
 
 def main():
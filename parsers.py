@@ -1,8 +1,9 @@
+from collections import deque
+
 from language import ElementBuilder
-from language import GrammarLoader
 from language import TokenBuilder
 
-from tables import ActionGotoTable
+from registry import registry
 
 
 class SyntaxError:
@@ -58,26 +59,44 @@ class StatusManager:
     def add_error(self, error):
         self.error_list.append(error)
 
+    def take_errors(self):
+        error_list = self.error_list
+        self.error_list = []
+        return error_list
+
     def next(self):
         self.token_index += 1
 
 
 class SyntaxParser:
 
-    def __init__(self):
-        self.tables = ActionGotoTable()
-        self.tables.load()
+    def __init__(self, grammar=None):
+        self.grammar = registry['default'] if grammar is None else grammar
 
-        self.formulas = GrammarLoader.formulas()
-        self.messages = GrammarLoader.messages()
+    @property
+    def tables(self):
+        return self.grammar.tables
+
+    @property
+    def formulas(self):
+        return self.grammar.formulas
+
+    @property
+    def messages(self):
+        return self.grammar.messages
 
     def __call__(self, token_list):
+        return list(self.iterate(token_list))
+
+    def iterate(self, token_list):
+        self.grammar.use()
         manager = StatusManager(token_list)
 
         while not manager.finished:
             self.parse_process(manager)
 
-        return manager.error_list
+            if len(manager.error_list) > 0:
+                yield from manager.take_errors()
 
     def error(self, token):
         return SyntaxError(token, self.messages[token])
@@ -96,7 +115,7 @@ class SyntaxParser:
             manager.parse_finished = True
 
         elif action_option.is_shift:
-            manager.push(action_option.number, ElementBuilder.token(manager.token))
+            manager.push(action_option.number, ElementBuilder.input(manager.token))
             manager.next()
 
         elif action_option.is_reduce:
@@ -108,3 +127,181 @@ class SyntaxParser:
             if manager.status is None:
                 manager.add_error(self.error(manager.token))
                 manager.parse_finished = True
+
+
+class StackNode:
+
+    __slots__ = ('status', 'symbol', 'link_nodes', 'linear', 'graph', 'index')
+
+    def __init__(self, status, symbol, link, graph=None, index=None):
+        self.status = status
+        self.symbol = symbol
+        self.link_nodes = None if graph is not None else [link]
+        self.linear = graph is not None or link.linear
+        self.graph = graph
+        self.index = index
+
+    @property
+    def links(self):
+        if self.link_nodes is None:
+            self.link_nodes = [self.graph.node(self.index - 1)] if self.index > 0 else []
+
+        return self.link_nodes
+
+    def add_link(self, link):
+        if link not in self.links:
+            self.links.append(link)
+            self.linear = False
+            return True
+        return False
+
+    def ancestors(self, length, first_link=None):
+        if length == 0:
+            return [self]
+
+        nodes = self.links if first_link is None else [first_link]
+
+        for _ in range(length - 1):
+            nodes = list({link: None for node in nodes for link in node.links})
+
+        return nodes
+
+
+class StackGraph:
+
+    def __init__(self, manager):
+        self.status_stack = manager.status_stack
+        self.symbol_stack = manager.symbol_stack
+        self.nodes = {}
+
+    @property
+    def top(self):
+        return self.node(len(self.status_stack) - 1)
+
+    def node(self, index):
+        if index not in self.nodes:
+            self.nodes[index] = StackNode(self.status_stack[index], self.symbol_stack[index], None, self, index)
+
+        return self.nodes[index]
+
+    @staticmethod
+    def refresh_linear(heads):
+        updated = True
+
+        while updated:
+            updated = False
+
+            for node in heads.values():
+                if node.linear and (len(node.links) > 1 or not all(link.linear for link in node.links)):
+                    node.linear = False
+                    updated = True
+
+    def linear_stacks(self, node):
+        status_stack = []
+        symbol_stack = []
+
+        while node.graph is not self:
+            status_stack.append(node.status)
+            symbol_stack.append(node.symbol)
+            node = node.links[0]
+
+        status_stack = self.status_stack[:node.index + 1] + status_stack[::-1]
+        symbol_stack = self.symbol_stack[:node.index + 1] + symbol_stack[::-1]
+
+        return status_stack, symbol_stack
+
+
+class GeneralizedParser(SyntaxParser):
+
+    def iterate(self, token_list):
+        self.grammar.use()
+        manager = StatusManager(token_list)
+        ambiguous_status = self.tables.actions.alternatives
+
+        while not manager.finished:
+            if manager.status in ambiguous_status and self.tables.ambiguous(manager.status, manager.token):
+                self.generalized_process(manager)
+            else:
+                self.parse_process(manager)
+
+            if len(manager.error_list) > 0:
+                yield from manager.take_errors()
+
+    def reduce_options(self, node, token):
+        return [option for option in self.tables.actions_all(node.status, token) if option.is_reduce]
+
+    def enqueue_reductions(self, reduce_buffer, node, token, first_link=None):
+        for option in self.reduce_options(node, token):
+            formula = self.formulas.list[option.number]
+
+            if first_link is None or formula.length > 0:
+                reduce_buffer.append((node, formula, first_link))
+
+    def reduce_heads(self, heads, token):
+        reduce_buffer = deque()
+
+        for node in list(heads.values()):
+            self.enqueue_reductions(reduce_buffer, node, token)
+
+        while len(reduce_buffer) > 0:
+            node, formula, first_link = reduce_buffer.popleft()
+
+            for ancestor in node.ancestors(formula.length, first_link):
+                if (status := self.tables.goto(ancestor.status, formula.l_part.symbol)) is None:
+                    continue
+
+                if status in heads:
+                    if heads[status].add_link(ancestor):
+                        self.enqueue_reductions(reduce_buffer, heads[status], token, ancestor)
+                else:
+                    heads[status] = StackNode(status, formula.l_part, ancestor)
+                    self.enqueue_reductions(reduce_buffer, heads[status], token)
+
+    def shift_heads(self, heads, token):
+        next_heads = {}
+        symbol = ElementBuilder.input(token)
+
+        for node in heads.values():
+            for option in self.tables.actions_all(node.status, token):
+                if not option.is_shift:
+                    continue
+
+                if option.number in next_heads:
+                    next_heads[option.number].add_link(node)
+                else:
+                    next_heads[option.number] = StackNode(option.number, symbol, node)
+
+        return next_heads
+
+    def accepted(self, heads, token):
+        return any(option.is_accept for node in heads.values() for option in self.tables.actions_all(node.status, token))
+
+    def recoverable(self, heads, token):
+        return any(self.tables.actions_all(node.status, token) for node in heads.values())
+
+    def generalized_process(self, manager):
+        graph = StackGraph(manager)
+        heads = {graph.top.status: graph.top}
+
+        while not manager.reached_end:
+            self.reduce_heads(heads, manager.token)
+            StackGraph.refresh_linear(heads)
+
+            if self.accepted(heads, manager.token):
+                manager.parse_finished = True
+                return
+
+            if len(next_heads := self.shift_heads(heads, manager.token)) == 0:
+                manager.add_error(self.error(manager.token))
+                manager.next()
+
+                while not manager.reached_end and not self.recoverable(heads, manager.token):
+                    manager.next()
+                continue
+
+            heads = next_heads
+            manager.next()
+
+            if len(heads) == 1 and (node := next(iter(heads.values()))).linear:
+                manager.status_stack, manager.symbol_stack = graph.linear_stacks(node)
+                return
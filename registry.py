@@ -0,0 +1,116 @@
+import os
+import sys
+
+from collections import OrderedDict
+
+from language import GrammarLoader
+from tables import ActionGotoTable
+
+
+class Grammar:
+
+    resource_names = ('tables', 'formulas', 'messages')
+
+    def __init__(self, name, grammar_path, message_path, table_directory, registry):
+        self.name = name
+        self.grammar_path = grammar_path
+        self.message_path = message_path
+        self.table_directory = table_directory
+        self.registry = registry
+        self.memory_size = 0
+
+    def __getattr__(self, name):
+        if name not in self.resource_names:
+            raise AttributeError(name)
+
+        self.use()
+        return object.__getattribute__(self, name)
+
+    @property
+    def loaded(self):
+        return all(name in self.__dict__ for name in self.resource_names)
+
+    @property
+    def version_paths(self):
+        table_paths = [os.path.join(self.table_directory, name) for name in ('action.txt', 'goto.txt')]
+
+        if os.path.exists(alternative_path := os.path.join(self.table_directory, 'alternative.txt')):
+            table_paths.append(alternative_path)
+
+        return [self.grammar_path, self.message_path, *table_paths]
+
+    def use(self):
+        return self.registry.acquire(self.name)
+
+    def load(self):
+        tables = ActionGotoTable(self.table_directory)
+        tables.load()
+
+        formulas = GrammarLoader.formulas(self.grammar_path)
+        messages = GrammarLoader.messages(self.message_path)
+
+        self.memory_size = tables.memory_size + formulas.memory_size + self.messages_size(messages)
+        self.tables = tables
+        self.formulas = formulas
+        self.messages = messages
+
+    @staticmethod
+    def messages_size(messages):
+        return sys.getsizeof(messages) + sum(sys.getsizeof(message) for message in messages.values())
+
+    def unload(self):
+        for name in self.resource_names:
+            self.__dict__.pop(name, None)
+
+        self.memory_size = 0
+
+
+class GrammarRegistry:
+
+    def __init__(self, memory_budget=None):
+        self.grammars = {}
+        self.memory_budget = memory_budget
+        self.loaded_names = OrderedDict()
+
+    def __contains__(self, name):
+        return name in self.grammars
+
+    def __getitem__(self, name):
+        return self.grammars[name]
+
+    @property
+    def memory_usage(self):
+        return sum(self.grammars[name].memory_size for name in self.loaded_names)
+
+    def register(self, name, grammar_path, message_path, table_directory):
+        self.grammars[name] = Grammar(name, grammar_path, message_path, table_directory, self)
+        return self.grammars[name]
+
+    def acquire(self, name):
+        grammar = self.grammars[name]
+
+        if not grammar.loaded:
+            grammar.load()
+
+        self.loaded_names[name] = None
+        self.loaded_names.move_to_end(name)
+        self.evict(name)
+
+        return grammar
+
+    def evict(self, keep_name=None):
+        if self.memory_budget is None:
+            return
+
+        for name in list(self.loaded_names):
+            if self.memory_usage <= self.memory_budget:
+                break
+            if name == keep_name:
+                continue
+
+            self.grammars[name].unload()
+            del self.loaded_names[name]
+
+
+registry = GrammarRegistry()
+registry.register('default', 'grammars/grammar.json', 'grammars/message.json', 'tables')
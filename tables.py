@@ -1,10 +1,16 @@
+import json
+import os
+import sys
+
 from collections import defaultdict
+from collections import deque
 
 from items import ItemBuilder
 from items import ItemsNumber
 from items import ItemSetUtils
 
 from language import GrammarLoader
+from language import Immutable
 from language import TokenParser
 
 
@@ -67,24 +73,36 @@ class AbstractTable:
         col = location[1]
 
         if col in self.elements[row]:
-            self.conflicts.append(ConflictBuilder.build(self.name, location, self.elements[row][col], value))
+            self.resolve(location, self.elements[row][col], value)
         else:
             self.elements[row][col] = value
 
+    def resolve(self, location, old_value, new_value):
+        self.conflicts.append(ConflictBuilder.build(self.name, location, old_value, new_value))
+
     def set_elements(self, elements):
         for element in elements:
             self.elements[element.row][element.col] = element.value
 
+    @property
+    def memory_size(self):
+        objects = {id(value): value for cols in self.elements.values() for value in (*cols, *cols.values())}
+
+        table_size = sys.getsizeof(self.elements) + sum(sys.getsizeof(cols) for cols in self.elements.values())
+        return table_size + sum(sys.getsizeof(value) for value in objects.values())
+
     @property
     def element_list(self):
         return [TableElement(row, col, value) for row, cols in self.elements.items() for col, value in cols.items()]
 
 
-class ActionOption:
+class ActionOption(Immutable):
+
+    __slots__ = ('option', 'number')
 
     def __init__(self, option, number):
-        self.option = option
-        self.number = number
+        object.__setattr__(self, 'option', option)
+        object.__setattr__(self, 'number', number)
 
     def __str__(self):
         return f'{self.option}-{self.number}'
@@ -101,20 +119,37 @@ class ActionOption:
     def is_reduce(self):
         return self.option == 'R'
 
+    @property
+    def is_error(self):
+        return self.option == 'E'
+
 
 class ActionBuilder:
 
+    options = {}
+
+    @staticmethod
+    def option(option, number):
+        if (option, number) not in ActionBuilder.options:
+            ActionBuilder.options[option, number] = ActionOption(option, number)
+
+        return ActionBuilder.options[option, number]
+
     @staticmethod
     def shift(status):
-        return ActionOption(option='S', number=int(status))
+        return ActionBuilder.option('S', int(status))
 
     @staticmethod
     def reduce(number):
-        return ActionOption(option='R', number=int(number))
+        return ActionBuilder.option('R', int(number))
 
     @staticmethod
     def accept():
-        return ActionOption(option='A', number=0)
+        return ActionBuilder.option('A', 0)
+
+    @staticmethod
+    def error():
+        return ActionBuilder.option('E', 0)
 
 
 class ActionParser:
@@ -129,11 +164,83 @@ class ActionParser:
             return ActionBuilder.shift(number)
         if option == 'R':
             return ActionBuilder.reduce(number)
+        if option == 'E':
+            return ActionBuilder.error()
         return None
 
 
 class ActionTable(AbstractTable):
 
+    def __init__(self, name):
+        super().__init__(name)
+        self.formulas = None
+        self.alternatives = defaultdict(dict)
+
+    def setup_precedences(self, formulas):
+        self.formulas = formulas
+
+    def conflict(self, location, old_value, new_value):
+        super().resolve(location, old_value, new_value)
+
+        row = location[0]
+        col = location[1]
+
+        if col not in self.alternatives[row]:
+            self.alternatives[row][col] = [old_value]
+
+        if new_value not in self.alternatives[row][col]:
+            self.alternatives[row][col].append(new_value)
+
+    def resolve(self, location, old_value, new_value):
+        if self.formulas is None:
+            return self.conflict(location, old_value, new_value)
+
+        if old_value.is_shift and new_value.is_reduce:
+            shift_option, reduce_option = old_value, new_value
+        elif old_value.is_reduce and new_value.is_shift:
+            shift_option, reduce_option = new_value, old_value
+        else:
+            return self.conflict(location, old_value, new_value)
+
+        token_precedence = self.formulas.precedences.token(location[1])
+        formula_precedence = self.formulas.precedences.formula(self.formulas.list[reduce_option.number])
+
+        if token_precedence is None or formula_precedence is None:
+            return self.conflict(location, old_value, new_value)
+
+        if formula_precedence.level > token_precedence.level:
+            self.settle(location, old_value, new_value, reduce_option)
+        elif formula_precedence.level < token_precedence.level:
+            self.settle(location, old_value, new_value, shift_option)
+        elif formula_precedence.is_left:
+            self.settle(location, old_value, new_value, reduce_option)
+        elif formula_precedence.is_right:
+            self.settle(location, old_value, new_value, shift_option)
+        else:
+            self.settle(location, old_value, new_value, ActionBuilder.error())
+
+    def settle(self, location, old_value, new_value, value):
+        row = location[0]
+        col = location[1]
+
+        self.elements[row][col] = value
+
+        if col not in self.alternatives.get(row, {}):
+            return
+
+        option_list = [option for option in self.alternatives[row][col] if option != old_value and option != new_value]
+
+        if not value.is_error:
+            option_list.insert(0, value)
+
+        if len(option_list) > 1:
+            self.alternatives[row][col] = option_list
+        else:
+            del self.alternatives[row][col]
+
+        if not self.alternatives[row]:
+            del self.alternatives[row]
+
     @staticmethod
     def deserialize(input):
         last_status, token, option = input.strip().split()
@@ -143,14 +250,44 @@ class ActionTable(AbstractTable):
 
         return TableElement(int(last_status), token, option)
 
-    def save(self):
-        with open('tables/action.txt', 'w') as actions:
+    @property
+    def alternative_list(self):
+        return [TableElement(row, col, value) for row, cols in self.alternatives.items() for col, values in cols.items() for value in values]
+
+    @property
+    def memory_size(self):
+        return super().memory_size + sum(sys.getsizeof(values) for cols in self.alternatives.values() for values in cols.values())
+
+    def set_alternatives(self, elements):
+        for element in elements:
+            self.alternatives[element.row].setdefault(element.col, []).append(element.value)
+
+    def options(self, row, col):
+        if row in self.alternatives and col in self.alternatives[row]:
+            return [option for option in self.alternatives[row][col] if not option.is_error]
+
+        if col in self.elements[row] and not self.elements[row][col].is_error:
+            return [self.elements[row][col]]
+        else:
+            return []
+
+    def save(self, directory='tables'):
+        with open(os.path.join(directory, 'action.txt'), 'w') as actions:
             actions.writelines(element.sequences for element in self.element_list)
 
-    def load(self):
-        with open('tables/action.txt', 'r') as actions:
+        with open(os.path.join(directory, 'alternative.txt'), 'w') as alternatives:
+            alternatives.writelines(element.sequences for element in self.alternative_list)
+
+    def load(self, directory='tables'):
+        with open(os.path.join(directory, 'action.txt'), 'r') as actions:
             self.set_elements(map(self.deserialize, actions.readlines()))
 
+        if not os.path.exists(os.path.join(directory, 'alternative.txt')):
+            return
+
+        with open(os.path.join(directory, 'alternative.txt'), 'r') as alternatives:
+            self.set_alternatives(map(self.deserialize, alternatives.readlines()))
+
 
 class GotoTable(AbstractTable):
 
@@ -161,14 +298,14 @@ class GotoTable(AbstractTable):
         last_status = int(last_status)
         next_status = int(next_status)
 
-        return TableElement(last_status, symbol, next_status)
+        return TableElement(last_status, sys.intern(symbol), next_status)
 
-    def save(self):
-        with open('tables/goto.txt', 'w') as gotos:
+    def save(self, directory='tables'):
+        with open(os.path.join(directory, 'goto.txt'), 'w') as gotos:
             gotos.writelines(element.sequences for element in self.element_list)
 
-    def load(self):
-        with open('tables/goto.txt', 'r') as gotos:
+    def load(self, directory='tables'):
+        with open(os.path.join(directory, 'goto.txt'), 'r') as gotos:
             self.set_elements(map(self.deserialize, gotos.readlines()))
 
 
@@ -187,11 +324,123 @@ class TableBuilder:
         return AbstractTable('transforms')
 
 
+class StatePaths:
+
+    def __init__(self, transforms):
+        self.previous = {0: None}
+        self.setup_previous(transforms)
+
+    def setup_previous(self, transforms):
+        status_buffer = deque([0])
+
+        while len(status_buffer) > 0:
+            last_status = status_buffer.popleft()
+
+            for element, next_status in transforms.elements.get(last_status, {}).items():
+                if next_status not in self.previous:
+                    self.previous[next_status] = (last_status, element)
+                    status_buffer.append(next_status)
+
+    def prefix(self, status):
+        elements = []
+
+        while (previous := self.previous.get(status)) is not None:
+            status, element = previous
+            elements.append(element)
+
+        return elements[::-1]
+
+
+class ShortestYields:
+
+    def __init__(self, formulas):
+        self.yields = {}
+        self.setup_yields(formulas)
+
+    def setup_yields(self, formulas):
+        updated = True
+
+        while updated:
+            updated = False
+
+            for formula in formulas.list:
+                if (tokens := self.formula_tokens(formula)) is None:
+                    continue
+
+                symbol = formula.l_part.symbol
+
+                if symbol not in self.yields or len(tokens) < len(self.yields[symbol]):
+                    self.yields[symbol] = tokens
+                    updated = True
+
+    def formula_tokens(self, formula):
+        tokens = []
+
+        for element in formula.r_part:
+            if (element_tokens := self.element_tokens(element)) is None:
+                return None
+
+            tokens.extend(element_tokens)
+
+        return tokens
+
+    def element_tokens(self, element):
+        if element.is_token:
+            return [element.token]
+        else:
+            return self.yields.get(element.symbol)
+
+    def expand(self, elements):
+        return [token for element in elements for token in self.element_tokens(element) or []]
+
+
+class ConflictAnalyzer:
+
+    def __init__(self, formulas, items_number, transforms):
+        self.items_number = items_number
+        self.paths = StatePaths(transforms)
+        self.yields = ShortestYields(formulas)
+
+    @staticmethod
+    def item_matched(item, col):
+        if item.search_finished:
+            return item.forward_token == col
+
+        element = item.current_element
+        return element == col or element.token == col or element.symbol == col
+
+    @staticmethod
+    def item_record(item):
+        if item.search_finished:
+            return str(item)
+        else:
+            return f'{item.formula}, {item.forward_index}'
+
+    def conflict_items(self, conflict):
+        items = filter(lambda item: self.item_matched(item, conflict.col), self.items_number.items(conflict.row))
+        return sorted({self.item_record(item) for item in items})
+
+    def conflict_detail(self, conflict):
+        prefix = self.paths.prefix(conflict.row)
+
+        return {
+            'table': conflict.name,
+            'status': conflict.row,
+            'element': str(conflict.col),
+            'old': str(conflict.old_value),
+            'new': str(conflict.new_value),
+            'items': self.conflict_items(conflict),
+            'prefix': [str(element) for element in prefix],
+            'example': [str(token) for token in self.yields.expand(prefix)],
+        }
+
+
 class BuildReport:
 
-    def __init__(self, conflicts, items_number):
+    def __init__(self, conflicts, items_number, analyzer):
         self.conflicts = conflicts
         self.items_number = items_number
+        self.analyzer = analyzer
 
     @property
     def items_records(self):
@@ -201,23 +450,42 @@ class BuildReport:
         yield f'total count: {self.items_number.items_count}\n'
 
     @property
-    def conflict_records(self):
-        for conflict in self.conflicts:
-            yield f'{conflict}\n'
+    def conflict_details(self):
+        return [self.analyzer.conflict_detail(conflict) for conflict in self.conflicts]
 
-    def save(self):
-        with open('reports/items.txt', 'w') as items:
+    @staticmethod
+    def conflict_records(details):
+        for detail in details:
+            yield f'{detail["table"]} ({detail["status"]}, {detail["element"]}) old: {detail["old"]} new: {detail["new"]}\n'
+
+            for item in detail['items']:
+                yield f'    item: {item}\n'
+
+            yield f'    prefix: {" ".join(detail["prefix"])}\n'
+            yield f'    example: {" ".join(detail["example"])}\n'
+
+    def save(self, details, directory='reports'):
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, 'items.txt'), 'w') as items:
             items.writelines(self.items_records)
 
-        with open('reports/conflicts.txt', 'w') as conflicts:
-            conflicts.writelines(self.conflict_records)
+        with open(os.path.join(directory, 'conflicts.txt'), 'w') as conflicts:
+            conflicts.writelines(self.conflict_records(details))
+
+    def save_json(self, details, directory='reports'):
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, 'conflicts.json'), 'w') as conflicts:
+            json.dump({'conflicts': details}, conflicts, indent=2)
 
 
 class ActionGotoTable:
 
-    def __init__(self):
+    def __init__(self, directory='tables'):
         self.actions = TableBuilder.action()
         self.gotos = TableBuilder.goto()
+        self.directory = directory
 
     @staticmethod
     def create_transforms(formulas):
@@ -244,6 +512,7 @@ class ActionGotoTable:
         return items_number, transforms
     
     def setup_tables(self, formulas):
+        self.actions.setup_precedences(formulas)
         items_number, transforms = self.create_transforms(formulas)
 
         for last_status, element, next_status in transforms.element_list:
@@ -261,24 +530,45 @@ class ActionGotoTable:
 
                 self.actions[number, item.forward_token] = option
 
-        return BuildReport(transforms.conflicts + self.actions.conflicts + self.gotos.conflicts, items_number)
+        conflicts = transforms.conflicts + self.actions.conflicts + self.gotos.conflicts
+        analyzer = ConflictAnalyzer(formulas, items_number, transforms)
+
+        return BuildReport(conflicts, items_number, analyzer)
+
+    def build(self, formulas, report_directory='reports'):
+        report = self.setup_tables(formulas)
+        details = report.conflict_details
 
-    def build(self, formulas):
-        self.setup_tables(formulas).save()
+        report.save(details, report_directory)
+        report.save_json(details, report_directory)
+
+    @property
+    def memory_size(self):
+        return self.actions.memory_size + self.gotos.memory_size
 
     def save(self):
-        self.actions.save()
-        self.gotos.save()
+        self.actions.save(self.directory)
+        self.gotos.save(self.directory)
 
     def load(self):
-        self.actions.load()
-        self.gotos.load()
+        self.actions.load(self.directory)
+        self.gotos.load(self.directory)
 
     def action(self, last_status, token):
         try:
-            return self.actions[last_status, token]
+            option = self.actions[last_status, token]
         except KeyError:
             return None
+
+        if option.is_error:
+            return None
+        return option
+
+    def actions_all(self, last_status, token):
+        return self.actions.options(last_status, token)
+
+    def ambiguous(self, last_status, token):
+        return last_status in self.actions.alternatives and token in self.actions.alternatives[last_status]
     
     def goto(self, last_status, symbol):
         try:
@@ -287,9 +577,9 @@ class ActionGotoTable:
             return None
 
 
-def build():
-    tables = ActionGotoTable()
-    tables.build(GrammarLoader.formulas())
+def build(grammar_path='grammars/grammar.json', directory='tables', report_directory='reports'):
+    tables = ActionGotoTable(directory)
+    tables.build(GrammarLoader.formulas(grammar_path), report_directory)
     tables.save()
 
 
@@ -0,0 +1,114 @@
+import gzip
+import json
+
+from abc import ABC
+from abc import abstractmethod
+
+
+class ErrorWriter(ABC):
+
+    def __init__(self, path, compress=False, aggregate=False, buffer_size=64 * 1024):
+        if compress:
+            self.outputs = gzip.open(path, 'wt')
+        else:
+            self.outputs = open(path, 'w', buffering=buffer_size)
+
+        self.aggregate = aggregate
+        self.write_header()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def write_header(self):
+        pass
+
+    def write_footer(self):
+        pass
+
+    @abstractmethod
+    def record(self, error, source_path):
+        pass
+
+    def write(self, error, source_path=None):
+        self.outputs.write(self.record(error, source_path))
+
+    def write_all(self, error_list, source_path=None):
+        for error in error_list:
+            self.write(error, source_path)
+
+    def close(self):
+        self.write_footer()
+        self.outputs.close()
+
+
+class TextWriter(ErrorWriter):
+
+    def record(self, error, source_path):
+        if self.aggregate:
+            return f'{source_path}: {error}\n'
+        else:
+            return f'{error}\n'
+
+
+class JsonLinesWriter(ErrorWriter):
+
+    def record(self, error, source_path):
+        return json.dumps({
+            'source': source_path,
+            'line': error.token.line,
+            'index': error.token.index,
+            'type': error.token.type,
+            'word': error.token.word,
+            'message': error.message,
+        }) + '\n'
+
+
+class SarifWriter(ErrorWriter):
+
+    def __init__(self, path, compress=False, aggregate=False, buffer_size=64 * 1024):
+        self.results_count = 0
+        super().__init__(path, compress, aggregate, buffer_size)
+
+    def write_header(self):
+        self.outputs.write('{"version": "2.1.0", "runs": [{"tool": {"driver": {"name": "SyntaxParser"}}, "results": [')
+
+    def write_footer(self):
+        self.outputs.write(']}]}\n')
+
+    def record(self, error, source_path):
+        location = {}
+
+        if source_path is not None:
+            location['artifactLocation'] = {'uri': source_path}
+
+        location['region'] = {'startLine': error.token.line, 'startColumn': error.token.index + 1}
+
+        result = json.dumps({
+            'ruleId': 'syntax-error',
+            'level': 'error',
+            'message': {'text': error.message},
+            'locations': [{'physicalLocation': location}],
+        })
+
+        self.results_count += 1
+
+        if self.results_count > 1:
+            return f',\n{result}'
+        else:
+            return f'\n{result}'
+
+
+class WriterBuilder:
+
+    writers = {
+        'text': TextWriter,
+        'jsonl': JsonLinesWriter,
+        'sarif': SarifWriter,
+    }
+
+    @staticmethod
+    def build(format, path, compress=False, aggregate=False):
+        return WriterBuilder.writers[format](path, compress, aggregate)